@@ -0,0 +1,30 @@
+"""
+Builds the optional Cython extension with the compiled Monte Carlo kernels. The app runs
+fine without it (pure NumPy/numba paths are used instead); build it in place with:
+
+    python setup.py build_ext --inplace
+"""
+
+import os
+
+import numpy as np
+from Cython.Build import cythonize
+from setuptools import Extension, setup
+
+# The C distribution functions (random_beta etc.) live in numpy's static npyrandom library.
+NPYRANDOM_LIB_DIR = os.path.join(os.path.dirname(np.random.__file__), "lib")
+
+extensions = [
+    Extension("_et_kernels",
+              ["src/_et_kernels.pyx"],
+              include_dirs=[np.get_include()],
+              libraries=["npyrandom"],
+              library_dirs=[NPYRANDOM_LIB_DIR],
+              define_macros=[("NPY_NO_DEPRECATED_API", "NPY_1_7_API_VERSION")]),
+]
+
+setup(
+    name="experiment-terminator",
+    package_dir={"": "src"},
+    ext_modules=cythonize(extensions, language_level=3),
+)
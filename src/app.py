@@ -1,33 +1,75 @@
 import altair as alt
 from experiment_terminator import ExperimentTerminator
 import numpy as np
-import pandas as pd
 import streamlit as st
 
 
+@st.cache_resource
+def get_experiment_terminator():
+    """
+    Build the ExperimentTerminator once per server process. Streamlit re-executes this module
+    on every widget interaction, and construction is no longer free (JIT warmup, RNG setup),
+    so cache the instance instead of rebuilding it on each rerun.
+    """
+
+    return ExperimentTerminator()
+
+
+@st.cache_data
+def run_analysis(planned_trials_a, planned_trials_b, completed_trials_a,
+                 completed_trials_b, successes_a, successes_b):
+    """
+    Run the analysis for one set of experiment parameters, cached on the six inputs so that
+    repeated clicks with unchanged parameters return instantly.
+    """
+
+    return get_experiment_terminator().analyze_experiment(planned_trials_a,
+                                                          planned_trials_b,
+                                                          completed_trials_a,
+                                                          completed_trials_b,
+                                                          successes_a,
+                                                          successes_b)
+
+
+@st.fragment
+def show_input_summary():
+    """
+    Display the parameters used for the analysis. This runs as a fragment only when the
+    analysis is actually triggered, so the summary string is not rebuilt on every widget
+    interaction rerun.
+    """
+
+    input_summary.markdown(
+        f"Analysis run with the following parameters: Control Group ({planned_trials_a} planned trials, "
+        f"{completed_trials_a} completed trials, {successes_a} successes), Test Group "
+        f"({planned_trials_b} planned trials, {completed_trials_b} completed trials, "
+        f"{successes_b} successes)")
+
+
 def analyze_experiment():
     """
     Upon clicking the button, run the experiment analyzer and display all of the output. This even
     displays a histogram and some Arnold images.
     """
 
-    exp_output = et.analyze_experiment(planned_trials_a,
-                                       planned_trials_b,
-                                       completed_trials_a,
-                                       completed_trials_b,
-                                       successes_a,
-                                       successes_b)
+    exp_output = run_analysis(planned_trials_a,
+                              planned_trials_b,
+                              completed_trials_a,
+                              completed_trials_b,
+                              successes_a,
+                              successes_b)
 
     # Only display the parameter summary information after the analysis has concluded.
-    input_summary.markdown(input_display)
-        
+    show_input_summary()
+
+
     # Display the summary statistics about the posterior distribution and posterior predictive
     # distribution
-    output_col1.metric("Observed Conversion Rate in Control Group", value=np.round(exp_output[0], 4))
-    output_col2.metric("Observed Conversion Rate in Test Group", value=np.round(exp_output[1], 4))
-    output_col3.metric("Estimated Lift (Posterior Mean)", value=str(np.round(100 * exp_output[2], 2)) + "%")
-    output_col4.metric("Probability Test Rate > Control Rate", value=np.round(exp_output[3], 4))
-    output_col5.metric("Probability of Significance at Experiment End", value=np.round(exp_output[4], 4))
+    output_col1.metric("Observed Conversion Rate in Control Group", value=f"{exp_output[0]:.4f}")
+    output_col2.metric("Observed Conversion Rate in Test Group", value=f"{exp_output[1]:.4f}")
+    output_col3.metric("Estimated Lift (Posterior Mean)", value=f"{100 * exp_output[2]:.2f}%")
+    output_col4.metric("Probability Test Rate > Control Rate", value=f"{exp_output[3]:.4f}")
+    output_col5.metric("Probability of Significance at Experiment End", value=f"{exp_output[4]:.4f}")
 
     # Apply logic determining what conclusion is reached.
     if exp_output[4] < 0.01 or exp_output[4] > .99:  # We know the future of the experiment - conclude.
@@ -49,16 +91,20 @@ def analyze_experiment():
         # Add an Arnold image to drive home the point.
         graph_col1.image('images/thou_shalt_not_terminate.jpeg', use_column_width=True)
 
-    # Create the histogram showing the posterior distribution of lifts.
-    chart_data = pd.DataFrame({'lift': exp_output[5]})
-    chart = alt.Chart(chart_data).mark_bar().encode(
-        alt.X("lift", bin=alt.Bin(maxbins=30)),
-        y="count()"
+    # Create the histogram showing the posterior distribution of lifts. Bin the samples in
+    # NumPy and ship only the 30 bin counts to Altair rather than every raw sample, which
+    # Altair would otherwise re-bin in the browser. With only 30 rows, pass the bins as
+    # plain records instead of paying for a pandas DataFrame conversion.
+    counts, edges = np.histogram(exp_output[5], bins=30)
+    bins = [{'lift_lo': float(lo), 'lift_hi': float(hi), 'count': int(n)}
+            for lo, hi, n in zip(edges[:-1], edges[1:], counts)]
+    chart = alt.Chart(alt.Data(values=bins)).mark_bar().encode(
+        alt.X("lift_lo:Q", title="lift"),
+        alt.X2("lift_hi:Q"),
+        y="count:Q"
     ).properties(title="Histogram of Posterior Distribution of Lift")
     graph_col2.altair_chart(chart, use_container_width=True)
 
-et = ExperimentTerminator()
-
 # Set overall page configuration variables
 st.set_page_config(layout="wide")
 st.title('Experiment Terminator')
@@ -83,15 +129,8 @@ successes_b = col2.number_input("Successes", min_value=0, key='successes_b', val
 analyze = st.button("Analyze Experiment for Termination", on_click=analyze_experiment)
 
 # Add a container to holds summary information on the parameters used to run the analysis. This gets
-# displayed back to the user so they know what information the code is using.
+# displayed back to the user (by show_input_summary) so they know what information the code is using.
 input_summary = st.container()
-input_display = "Analysis run with the following parameters: Control Group ("
-input_display += str(planned_trials_a) + " planned trials, "
-input_display += str(completed_trials_a) + " completed trials, "
-input_display += str(successes_a) + " successes), Test Group ("
-input_display += str(planned_trials_b) + " planned trials, "
-input_display += str(completed_trials_b) + " completed trials, "
-input_display += str(successes_b) + " successes)"
 input_summary.markdown("")
 
 # Add a container to hold summary statistics about the posterior distribution and posterior